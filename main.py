@@ -1,32 +1,60 @@
 """FastAPI implementation of the Todo REST API."""
 
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 
 from models import Todo, TodoCreate
-from persistence import TodoDao
+from persistence import SqliteTodoDao, TodoDao
 
 
 # Data Access Object (dao) provides persistence operations for todo.
-dao = TodoDao("todo_data.json")
+# Set TODO_BACKEND=sqlite to use the SQLite backend instead of the
+# default JSON file + write-ahead log.
+if os.environ.get("TODO_BACKEND") == "sqlite":
+    dao = SqliteTodoDao("todo_data.db")
+else:
+    dao = TodoDao("todo_data.json")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Checkpoint and close the write-ahead log on shutdown."""
+    yield
+    dao.close()
+
 
 # 'app' is refers to FastAPI
 # use param: redirect_slashes=False to disable automatic
 # redirection of paths without trailing slash.
-app = FastAPI(title="Todo REST API")
+# orjson (C implementation) also serializes every JSON response.
+app = FastAPI(title="Todo REST API", lifespan=lifespan,
+              default_response_class=ORJSONResponse)
 
 
 ### REST service URLs and request handlers ###
 
-@app.get("/todos/", response_model=list[Todo])
+@app.get("/todos/")
 def get_todos():
-    """Get all todos."""
-    return dao.get_all()
+    """Get all todos.
+
+    Returns the DAO's cached JSON bytes directly, skipping per-request
+    Pydantic serialization of every todo.
+    """
+    return Response(content=dao.get_all_json(),
+                    media_type="application/json")
 
 
 @app.post("/todos/", response_model=Todo, status_code=201)
-def create_todo(todo: TodoCreate, request: Request, response: Response):
+async def create_todo(todo: TodoCreate, request: Request, response: Response):
     """Create and save a new todo. A unique ID is assigned."""
-    created = dao.save(todo)
+    # Run the blocking disk write in a worker thread so the event loop
+    # keeps serving other requests while the WAL append (and fsync)
+    # is in progress.
+    created = await asyncio.to_thread(dao.save, todo)
     # Return the location of the new todo.
     location = f"/todos/{created.id}"
     # A cleaner way to get the location URL is reverse mapping.
@@ -35,7 +63,17 @@ def create_todo(todo: TodoCreate, request: Request, response: Response):
     return created
 
 
-@app.get("/todos/{todo_id}", response_model=Todo)
+@app.post("/todos/batch", response_model=list[Todo], status_code=201)
+async def create_todos_batch(todos: list[TodoCreate]):
+    """Create and save several todos in one request.
+
+    The whole batch is persisted with a single write, so this is much
+    cheaper than POSTing the todos one at a time.
+    """
+    return await asyncio.to_thread(dao.save_many, todos)
+
+
+@app.get("/todos/{todo_id}")
 def get_todo(todo_id: int):
     """Get a specific todo by id.
 
@@ -44,39 +82,41 @@ def get_todo(todo_id: int):
     todo = dao.get(todo_id)
     if not todo:
         raise HTTPException(status_code=404, detail="Todo not found")
-    return todo
+    # The DAO already holds a validated Todo; return its dict directly
+    # so FastAPI skips the response_model re-validation pass.
+    return todo.model_dump()
 
 
 @app.put("/todos/{todo_id}", response_model=Todo)
-def update_todo(todo_id: int, todo: TodoCreate):
+async def update_todo(todo_id: int, todo: TodoCreate):
     """Update an existing Todo.
 
     :param todo_id: identifier of the todo to update
     :param todo: revised data for the todo
     """
-    existing = dao.get(todo_id)
-    if not existing:
+    # One fused lookup-and-update under the DAO's lock, rather than a
+    # get followed by an update that re-checks the id.
+    updated = await asyncio.to_thread(dao.update_by_id,
+                                      todo_id, todo.text, todo.done)
+    if updated is None:
         raise HTTPException(status_code=404, detail="Todo not found")
-
-    updated = Todo(
-        id=todo_id,
-        text=todo.text,
-        done=todo.done,
-    )
-    return dao.update(updated)
+    return updated
 
 
 @app.delete("/todos/{todo_id}", status_code=204)
-def delete_todo(todo_id: int):
+async def delete_todo(todo_id: int):
     """Delete a Todo.
 
     :param todo_id: identifier of the todo to delete
 
-    Return 204 (or 200 + message) if todo is deleted.
-    Return {what?} if todo is not found.
+    Return 204 if the todo is deleted, 404 if it is not found.
     """
-    # TODO implement this method
-    raise HTTPException(status_code=500, detail="Not implemented yet")
+    try:
+        # O(1): the DAO appends a tombstone record to the WAL; the
+        # entry is reclaimed from the data file at the next checkpoint.
+        await asyncio.to_thread(dao.delete, todo_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Todo not found")
 
 
 @app.options("/todos/")
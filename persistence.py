@@ -1,34 +1,170 @@
 """A Data Access Object (DAO) for CRUD operations on Todo items.
 
-Implements thread-safe file-based persistence using JSON.
+Implements thread-safe file-based persistence using a JSON checkpoint
+file plus an append-only write-ahead log (WAL). Each mutation appends
+one small operation record to the WAL instead of rewriting the whole
+file, so the cost of a save/update/delete does not grow with the
+number of todos. A checkpoint periodically rewrites the compact JSON
+file and truncates the WAL.
+
+WAL records are framed as `length (4B) | crc32c (4B) | json payload`;
+replay verifies each checksum and stops at the first bad record, so a
+write torn by a crash cannot poison the records before it.
 """
-import json
 import logging
 import os
-from threading import Lock
+import queue
+import sqlite3
+import struct
+import threading
+from threading import Event, Lock, Thread
 from typing import Dict, Iterable
 
+import crc32c
+import ijson
+import lz4.frame
+import orjson
+from pydantic import TypeAdapter
+from readerwriterlock import rwlock
+
 from models import Todo, TodoCreate
 
+# Serializes a whole list of todos in pydantic-core (compiled Rust)
+# instead of a Python-level model_dump loop per item.
+TODO_LIST_ADAPTER = TypeAdapter(list[Todo])
+
+
+def _make_todo_encoder():
+    """Generate a JSON encoder specialized to the Todo schema.
+
+    The Todo schema is fixed at import time, so instead of the generic
+    encode path (walk the model, build a dict, walk the dict) we
+    generate source for an `encode_todo(t) -> bytes` function whose
+    field names are baked in as byte literals, and exec it. Returns
+    None when a field has no specialized emitter (e.g. after a model
+    change); callers must then fall back to the generic encoder.
+    """
+    emitters = {
+        int: "str(t.{f}).encode()",
+        str: "orjson.dumps(t.{f})",
+        bool: "(b'true' if t.{f} else b'false')",
+    }
+    parts = []
+    for name, field in Todo.model_fields.items():
+        emit = emitters.get(field.annotation)
+        if emit is None:
+            return None
+        parts.append(f"b'\"{name}\":' + " + emit.format(f=name))
+    body = " + b',' + ".join(parts)
+    source = f"def encode_todo(t):\n    return b'{{' + {body} + b'}}'\n"
+    namespace = {"orjson": orjson}
+    exec(source, namespace)
+    return namespace["encode_todo"]
+
+
+# Schema-specialized encoder, or None if the schema outgrew it.
+encode_todo = _make_todo_encoder()
+
+
+class _WalCommit:
+    """Commit token for one batch of enqueued WAL records.
+
+    The writer thread signals the token once the records are on disk,
+    or hands it the exception if the write failed; wait() re-raises
+    that exception in the enqueuing thread so callers see the failure
+    instead of blocking forever or reporting a phantom success.
+    """
+    def __init__(self):
+        self._done = Event()
+        self._error: BaseException | None = None
+
+    def set(self, error: BaseException | None = None) -> None:
+        """Mark the commit finished, optionally with a failure."""
+        self._error = error
+        self._done.set()
+
+    def wait(self) -> None:
+        """Block until the commit finishes; re-raise any write error."""
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+
 
 class TodoDao:
     """Persistence operations for Todo items.
 
     Args:
-        filename (str): The JSON file to use for storage.
+        filename (str): The JSON checkpoint file to use for storage.
         If the file does not exist, it will be created.
+        A write-ahead log is kept alongside it in `filename + ".wal"`.
+        durable (bool): If True (default), fsync the WAL after every
+        append. Set False to trade durability for write throughput.
     Methods:
         get(todo_id: int) -> Todo|None: Get a Todo by id.
         get_all() -> list[Todo]:        Get all Todo items.
+        get_all_json() -> bytes:        All Todo items as JSON bytes (cached).
         save(new_todo: TodoCreate) -> Todo: Save a new Todo.
+        save_many(todo_creates: list[TodoCreate]) -> list[Todo]:
+                                        Save a batch of new Todos.
         update(todo: Todo) -> None:     Update an existing Todo.
+        update_by_id(todo_id: int, text: str, done: bool) -> Todo|None:
+                                        Look up and update in one step.
         delete(todo_id: int) -> None:   Delete a Todo by id.
+        checkpoint() -> None:           Snapshot state and truncate the WAL.
+        close() -> None:                Checkpoint and close the WAL.
     """
-    def __init__(self, filename: str):
+    # Number of WAL appends before an automatic checkpoint.
+    CHECKPOINT_INTERVAL = 100
+    # Max records the writer thread folds into one write + fsync.
+    GROUP_COMMIT_MAX_RECORDS = 128
+    # Checkpoint files at or above this size are stream-parsed with
+    # ijson instead of being read into memory in one piece.
+    STREAM_PARSE_THRESHOLD = 1 << 20  # 1 MiB
+    # Tag written into each checkpoint; bump when the Todo model
+    # changes so older checkpoints get re-validated on load.
+    SCHEMA_VERSION = 1
+    # LZ4 frame magic; identifies compressed checkpoint files.
+    LZ4_MAGIC = b'\x04"M\x18'
+    # Header written at the start of every framed WAL, so replay can
+    # tell framed logs from legacy JSON-lines logs unambiguously.
+    WAL_MAGIC = b"#todo-wal-v1\n"
+    # Number of lock stripes for per-id update serialization.
+    LOCK_STRIPES = 64
+
+    def __init__(self, filename: str, durable: bool = True):
         self.filename = filename
-        self.lock = Lock()
-        # read todos into memory.
+        self.wal_filename = filename + ".wal"
+        # Readers-writer lock: many concurrent readers, one writer.
+        # The fair variant avoids writer starvation under read-heavy load.
+        self.lock = rwlock.RWLockFair()
+        # Striped locks: updates to different ids only contend when
+        # they hash to the same stripe, instead of on one global lock.
+        self._stripes = [Lock() for _ in range(self.LOCK_STRIPES)]
+        self.durable = durable
+        # Memoized JSON encoding of all todos; invalidated on mutation.
+        # The counter and its lock let get_all_json detect a mutation
+        # that happened while it was encoding (see _invalidate_cache).
+        self._cached_all_json: bytes | None = None
+        self._mutations = 0
+        self._cache_lock = Lock()
+        # read checkpoint + WAL into memory.
         self.todos = self._read_all()
+        # Highest id ever assigned this session; kept incrementally so
+        # id allocation is O(1) instead of scanning all keys per save.
+        # Deletes leave it untouched, keeping ids monotonic.
+        self._max_id = max(self.todos, default=0)
+        # open the WAL for appending; unbuffered so records hit the OS
+        # immediately and fsync (when durable) makes them crash-safe.
+        self.wal = open(self.wal_filename, "ab", buffering=0)
+        if self.wal.tell() == 0:
+            self.wal.write(self.WAL_MAGIC)
+        self._ops_since_checkpoint = 0
+        # Single writer thread: concurrent mutations enqueue records and
+        # the thread group-commits them with one write and one fsync.
+        self.pending: queue.Queue = queue.Queue()
+        self._writer = Thread(target=self._writer_loop, daemon=True,
+                              name=f"wal-writer-{filename}")
+        self._writer.start()
 
     def _read_all(self) -> Dict[int, Todo]:
         """Read all Todo items from a JSON file.
@@ -36,50 +172,324 @@ class TodoDao:
         :return: A dict of Todo items, keyed by Todo id.
         """
         todos: Dict[int, Todo] = {}
-        if not os.path.exists(self.filename):
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Todo data file '{self.filename}' not found. "
-                           "Returning an empty todo list.")
+        with self.lock.gen_wlock():
+            if os.path.exists(self.filename):
+                with open(self.filename, "rb") as file:
+                    size = os.fstat(file.fileno()).st_size
+                    for todo in self._iter_checkpoint(file, size):
+                        todos[todo.id] = todo
+            else:
+                logger = logging.getLogger(__name__)
+                logger.warning(f"Todo data file '{self.filename}' not found. "
+                               "Starting from an empty checkpoint.")
+            # Replay the WAL over the checkpoint state. Records written
+            # after the last checkpoint are the authoritative tail.
+            if os.path.exists(self.wal_filename):
+                # One read() for the whole log instead of buffered
+                # line-by-line reads; orjson handles UTF-8 decoding in C.
+                with open(self.wal_filename, "rb") as wal:
+                    raw = wal.read()
+                self._replay_wal(raw, todos)
             return todos
-        with self.lock:
-            with open(self.filename, "r") as file:
-                for todo_data in json.load(file):
-                    todo_id = todo_data["id"]
-                    # Use Pydantic to validate and instantiate the model.
-                    todos[todo_id] = Todo.model_validate(todo_data)
-                    # for a flexible schema, do this instead:
-                    # todos[todo_id] = Todo(**todo_data)
-                return todos
+
+    @staticmethod
+    def _apply_wal_record(record: dict, todos: Dict[int, Todo]) -> None:
+        """Apply one replayed WAL operation record to `todos`."""
+        if record["op"] == "put":
+            todo = Todo.model_validate(record["todo"])
+            todos[todo.id] = todo
+        elif record["op"] == "del":
+            todos.pop(record["id"], None)
+
+    def _replay_wal(self, raw: bytes, todos: Dict[int, Todo]) -> None:
+        """Replay WAL bytes, dispatching on the log format.
+
+        Framed logs start with WAL_MAGIC. A log without it is either
+        legacy (newline-delimited JSON, no checksums) or framed but
+        written before the magic existed — and a leading "{" does not
+        settle it, since the first byte of a frame is the low byte of
+        the payload length, which can be 0x7b ("{") too. So the legacy
+        parse is attempted on the whole log first and the framed path
+        is the fallback if any line fails to parse.
+        """
+        if raw.startswith(self.WAL_MAGIC):
+            self._replay_framed(raw[len(self.WAL_MAGIC):], todos)
+            return
+        if raw[:1] == b"{":
+            try:
+                records = [orjson.loads(line) for line in raw.splitlines()
+                           if line.strip()]
+            except orjson.JSONDecodeError:
+                pass  # not legacy after all; fall through to framed
+            else:
+                for record in records:
+                    self._apply_wal_record(record, todos)
+                return
+        self._replay_framed(raw, todos)
+
+    def _replay_framed(self, raw: bytes, todos: Dict[int, Todo]) -> None:
+        """Replay framed records, stopping at the first bad one.
+
+        Each record is `length (4B) | crc32c (4B) | json payload`. A
+        truncated or checksum-failing record is treated as a torn tail
+        from a crash mid-write: it and everything after it is ignored
+        with a warning.
+        """
+        offset = 0
+        while offset + 8 <= len(raw):
+            length, crc = struct.unpack_from("<II", raw, offset)
+            start = offset + 8
+            end = start + length
+            if end > len(raw):
+                break  # record truncated mid-write
+            payload = raw[start:end]
+            if crc32c.crc32c(payload) != crc:
+                break  # record corrupted
+            self._apply_wal_record(orjson.loads(payload), todos)
+            offset = end
+        if offset < len(raw):
+            logger = logging.getLogger(__name__)
+            logger.warning(
+                f"WAL '{self.wal_filename}' has a corrupt or torn tail; "
+                f"ignoring {len(raw) - offset} trailing bytes.")
+
+    def _iter_checkpoint(self, file, size: int):
+        """Yield Todo models from an open checkpoint file.
+
+        Checkpoints written at the current SCHEMA_VERSION contain only
+        data that was validated before persisting, so their records are
+        rebuilt with model_construct, skipping Pydantic validation.
+        Legacy bare-list files and checkpoints from another schema
+        version fall back to full model_validate. Files larger than
+        STREAM_PARSE_THRESHOLD are parsed incrementally so peak memory
+        stays bounded instead of ~3x the file size.
+        """
+        version = None
+        # Compressed checkpoints start with the LZ4 frame magic;
+        # anything else is plain JSON from an older version.
+        if file.read(4) == self.LZ4_MAGIC:
+            file.seek(0)
+            file = lz4.frame.open(file, mode="rb")
+        else:
+            file.seek(0)
+        # Peek at the first byte: "[" is the legacy list format,
+        # "{" is the versioned {"schema": N, "todos": [...]} envelope.
+        first = file.read(1)
+        file.seek(0)
+        if size < self.STREAM_PARSE_THRESHOLD:
+            # small file: one read, parse fully in C.
+            doc = orjson.loads(file.read())
+            if isinstance(doc, dict):
+                version = doc.get("schema")
+                items = doc.get("todos", [])
+            else:
+                items = doc
+        elif first == b"[":
+            items = ijson.items(file, "item")
+        else:
+            # Stream the envelope: capture the schema tag from the
+            # event stream while handing the todo items to the builder.
+            def capture_schema(events):
+                nonlocal version
+                for prefix, event, value in events:
+                    if prefix == "schema" and event == "number":
+                        version = value
+                    yield prefix, event, value
+
+            items = ijson.items(
+                capture_schema(ijson.parse(file)), "todos.item")
+
+        for todo_data in items:
+            if version == self.SCHEMA_VERSION:
+                # trusted data from this schema: skip re-validation.
+                yield Todo.model_construct(**todo_data)
+            else:
+                yield Todo.model_validate(todo_data)
 
     def _write_all(self, todos: Iterable[Todo]) -> None:
-        """Write all Todo items to the JSON file."""
-        # TODO: should write to a temp file and then rename to avoid data loss.
-        with self.lock:
-            with open(self.filename, "w") as f:
-                # Convert Pydantic Todo models to plain dicts before dumping.
-                serializable = [t.model_dump() for t in todos]
-                json.dump(serializable, f, indent=2)
+        """Atomically write all Todo items to the JSON file.
+
+        Writes to a temp file, fsyncs it, then renames it over the real
+        file with os.replace, so a crash mid-write can never leave a
+        truncated checkpoint behind. The caller must hold the write lock.
+        """
+        tmp = self.filename + ".tmp"
+        if encode_todo is not None:
+            # schema-specialized encoder: bytes out, no dicts built.
+            data = (b'{"schema": %d, "todos": [%s]}'
+                    % (self.SCHEMA_VERSION,
+                       b",".join(encode_todo(t) for t in todos)))
+        else:
+            payload = {"schema": self.SCHEMA_VERSION,
+                       "todos": TODO_LIST_ADAPTER.dump_python(list(todos))}
+            data = orjson.dumps(payload)
+        with open(tmp, "wb") as f:
+            # LZ4: the repeated field names compress several-fold, and
+            # decompression runs at GB/s, so reload stays CPU-cheap.
+            f.write(lz4.frame.compress(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.filename)
+        # fsync the directory so the rename itself survives a crash.
+        dir_fd = os.open(os.path.dirname(os.path.abspath(self.filename)),
+                         os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    @staticmethod
+    def _frame_record(record: dict) -> bytes:
+        """Frame one WAL record as `length | crc32c | json payload`.
+
+        crc32c uses the SSE4.2 CRC32 instruction where available, so
+        the checksum costs microseconds per record.
+        """
+        payload = orjson.dumps(record)
+        return struct.pack("<II", len(payload),
+                           crc32c.crc32c(payload)) + payload
+
+    def _enqueue_wal(self, records: list[dict]) -> _WalCommit:
+        """Hand records to the writer thread for appending to the WAL.
+
+        The caller must hold the write lock so records are queued in the
+        same order the in-memory dict was mutated. The returned token is
+        signalled once the records are on disk; wait on it *after*
+        releasing the lock so other writers can join the same group
+        commit.
+
+        :param records: dicts like {"op": "put", "todo": {...}} or
+            {"op": "del", "id": todo_id}.
+        :return: a commit token signalled when the records are written.
+        """
+        done = _WalCommit()
+        self.pending.put((records, done))
+        return done
+
+    def _writer_loop(self) -> None:
+        """Drain pending records and group-commit them to the WAL.
+
+        Blocks for the first item, then grabs whatever else is already
+        queued (up to GROUP_COMMIT_MAX_RECORDS) so N concurrent writers
+        share one write and one fsync instead of issuing N.
+        """
+        while True:
+            records, done = self.pending.get()
+            batch = list(records)
+            waiters = [done]
+            dequeued = 1
+            while len(batch) < self.GROUP_COMMIT_MAX_RECORDS:
+                try:
+                    more, ev = self.pending.get_nowait()
+                except queue.Empty:
+                    break
+                batch.extend(more)
+                waiters.append(ev)
+                dequeued += 1
+            buf = b"".join(self._frame_record(r) for r in batch)
+            # Catch everything (including OSError for a full disk and
+            # ValueError for a WAL closed mid-shutdown): the waiters
+            # must always be woken — with the failure attached — and
+            # the loop must survive to serve later commits.
+            error = None
+            try:
+                self.wal.write(buf)
+                if self.durable:
+                    os.fsync(self.wal.fileno())
+            except Exception as exc:
+                error = exc
+            else:
+                self._ops_since_checkpoint += len(batch)
+            for ev in waiters:
+                ev.set(error)
+            for _ in range(dequeued):
+                self.pending.task_done()
+
+    def _maybe_checkpoint(self) -> None:
+        """Checkpoint if enough WAL records have accumulated."""
+        if self._ops_since_checkpoint >= self.CHECKPOINT_INTERVAL:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Write a compact snapshot of all todos and truncate the WAL.
+
+        After a checkpoint the JSON file alone reflects the full state,
+        so replaying the (now empty) WAL is a no-op.
+        """
+        with self.lock.gen_wlock():
+            self._write_all(list(self.todos.values()))
+            self.wal.truncate(0)
+            self.wal.write(self.WAL_MAGIC)
+            self._ops_since_checkpoint = 0
+
+    def close(self) -> None:
+        """Checkpoint pending WAL records and close the WAL file."""
+        if self.wal.closed:
+            return
+        # Let the writer thread drain everything that is queued, then
+        # fold the final state into the checkpoint file.
+        self.pending.join()
+        self.checkpoint()
+        self.wal.close()
 
     def _next_id(self) -> int:
         """Generates an available id for a new Todo.
 
         :return: An integer id not currently used by any Todo.
         """
-        if not self.todos:
-            return 1
-        # the todo keys are the ids
-        return max(self.todos.keys()) + 1
+        return self._max_id + 1
 
     def get(self, todo_id: int) -> Todo | None:
         """Get a Todo by its id.
 
         :return: The Todo with the given id, or None if not found.
         """
-        return self.todos.get(todo_id, None)
+        with self.lock.gen_rlock():
+            return self.todos.get(todo_id, None)
 
     def get_all(self) -> list[Todo]:
         """Get all Todo items."""
-        return list(self.todos.values())
+        with self.lock.gen_rlock():
+            return list(self.todos.values())
+
+    def _invalidate_cache(self) -> None:
+        """Drop the serialized-list cache and bump the mutation counter.
+
+        Runs under its own lock: updates hold only a stripe plus the
+        shared read lock, so two of them may race on the counter, and
+        get_all_json must observe invalidations atomically.
+        """
+        with self._cache_lock:
+            self._mutations += 1
+            self._cached_all_json = None
+
+    def get_all_json(self) -> bytes:
+        """Get all Todo items as a JSON-encoded bytes payload.
+
+        The encoding is cached between mutations, so on a read-heavy
+        workload repeated calls cost a single attribute read instead of
+        re-serializing every todo.
+        """
+        with self.lock.gen_rlock():
+            cached = self._cached_all_json
+            if cached is None:
+                seen = self._mutations
+                if encode_todo is not None:
+                    cached = (b"[" +
+                              b",".join(encode_todo(t)
+                                        for t in self.todos.values()) +
+                              b"]")
+                else:
+                    # generic fallback: JSON bytes from pydantic-core.
+                    cached = TODO_LIST_ADAPTER.dump_json(
+                        list(self.todos.values()))
+                # Publish only if nothing mutated while we encoded;
+                # otherwise these bytes may predate the mutation and
+                # would be served until the *next* invalidation.
+                with self._cache_lock:
+                    if self._mutations == seen:
+                        self._cached_all_json = cached
+            return cached
 
     def save(self, todo_create: TodoCreate) -> Todo:
         """Save a new Todo and assign it an id.
@@ -87,26 +497,230 @@ class TodoDao:
         :param todo_create: a TodoCreate object with info for the new Todo.
         :return: The created Todo with its assigned id.
         """
-        todo_id = self._next_id()
-        # model_dump is provided by Pydantic Model class.
-        todo = Todo(id=todo_id, **todo_create.model_dump())
-        self.todos[todo_id] = todo
-        # terribly inefficient but write all todos each time.
-        self._write_all(list(self.todos.values()))
+        with self.lock.gen_wlock():
+            # Compute the id under the write lock so concurrent saves
+            # cannot observe the same value (no check-then-recheck).
+            self._max_id += 1
+            todo_id = self._max_id
+            # model_dump is provided by Pydantic Model class.
+            todo = Todo(id=todo_id, **todo_create.model_dump())
+            self.todos[todo_id] = todo
+            self._invalidate_cache()
+            # O(1) append instead of rewriting the whole file.
+            done = self._enqueue_wal([{"op": "put", "todo": todo.model_dump()}])
+        done.wait()
+        self._maybe_checkpoint()
         return todo
 
+    def save_many(self, todo_creates: list[TodoCreate]) -> list[Todo]:
+        """Save several new Todos in one batch.
+
+        All ids are assigned contiguously and the whole batch is written
+        to the WAL as a single append, so creating N todos costs one
+        write instead of N.
+
+        :param todo_creates: TodoCreate objects with info for the new Todos.
+        :return: The created Todos with their assigned ids, in order.
+        """
+        with self.lock.gen_wlock():
+            start_id = self._next_id()
+            created = [Todo(id=start_id + i, **tc.model_dump())
+                       for i, tc in enumerate(todo_creates)]
+            self._max_id += len(created)
+            for todo in created:
+                self.todos[todo.id] = todo
+            self._invalidate_cache()
+            done = self._enqueue_wal(
+                [{"op": "put", "todo": t.model_dump()} for t in created])
+        done.wait()
+        self._maybe_checkpoint()
+        return created
+
     def update(self, todo: Todo) -> Todo:
-        """Update an existing Todo."""
+        """Update an existing Todo.
+
+        Holds the stripe lock for this id plus the *shared* read lock:
+        replacing the value of an existing key never resizes the dict,
+        so updates to different ids can run in parallel with each other
+        and with readers, while save/delete (which resize the dict)
+        still take the exclusive write lock.
+        """
         todo_id = todo.id
-        if todo_id not in self.todos:
+        stripe = self._stripes[todo_id % self.LOCK_STRIPES]
+        with stripe, self.lock.gen_rlock():
+            if todo_id not in self.todos:
+                raise ValueError(f"Todo id {todo.id} not found in saved Todos")
+            self.todos[todo_id] = todo
+            self._invalidate_cache()
+            done = self._enqueue_wal([{"op": "put", "todo": todo.model_dump()}])
+        done.wait()
+        self._maybe_checkpoint()
+        return todo
+
+    def update_by_id(self, todo_id: int, text: str, done: bool) -> Todo | None:
+        """Update the Todo with the given id, if it exists.
+
+        Fuses the lookup and the update into one lock hold and one
+        hash lookup, instead of the get-then-update pair that checks
+        the dict twice.
+
+        :return: The updated Todo, or None if the id is unknown.
+        """
+        stripe = self._stripes[todo_id % self.LOCK_STRIPES]
+        with stripe, self.lock.gen_rlock():
+            existing = self.todos.get(todo_id)
+            if existing is None:
+                return None
+            updated = existing.model_copy(update={"text": text, "done": done})
+            self.todos[todo_id] = updated
+            self._invalidate_cache()
+            written = self._enqueue_wal(
+                [{"op": "put", "todo": updated.model_dump()}])
+        written.wait()
+        self._maybe_checkpoint()
+        return updated
+
+    def delete(self, todo_id: int) -> None:
+        """Delete a Todo by its id."""
+        with self.lock.gen_wlock():
+            if todo_id not in self.todos:
+                raise ValueError(f"Todo id {todo_id} not found")
+            del self.todos[todo_id]
+            self._invalidate_cache()
+            # A tombstone; the todo is reclaimed at the next checkpoint.
+            done = self._enqueue_wal([{"op": "del", "id": todo_id}])
+        done.wait()
+        self._maybe_checkpoint()
+
+
+class SqliteTodoDao:
+    """Persistence operations for Todo items, backed by SQLite.
+
+    An alternative to TodoDao for deployments that outgrow the JSON
+    file: SQLite in WAL journal mode gives per-row updates, concurrent
+    readers alongside a single writer, and crash recovery without the
+    DAO managing its own log. The public interface matches TodoDao.
+
+    Args:
+        filename (str): The SQLite database file to use for storage.
+        If the file does not exist, it will be created.
+    """
+    def __init__(self, filename: str):
+        self.filename = filename
+        # SQLite connections are not thread-safe; keep one per thread.
+        self._local = threading.local()
+        self._conn().execute(
+            """CREATE TABLE IF NOT EXISTS todos (
+                   id INTEGER PRIMARY KEY AUTOINCREMENT,
+                   text TEXT NOT NULL,
+                   done INTEGER NOT NULL DEFAULT 0)""")
+
+    def _conn(self) -> sqlite3.Connection:
+        """Get (or create) this thread's database connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # autocommit mode: each statement is its own transaction
+            # unless an explicit BEGIN is issued (see save_many).
+            conn = sqlite3.connect(self.filename, isolation_level=None)
+            # WAL mode: readers do not block the writer and vice versa.
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _row_to_todo(row) -> Todo:
+        # rows were validated before being inserted; skip re-validation.
+        return Todo.model_construct(id=row[0], text=row[1], done=bool(row[2]))
+
+    def get(self, todo_id: int) -> Todo | None:
+        """Get a Todo by its id.
+
+        :return: The Todo with the given id, or None if not found.
+        """
+        row = self._conn().execute(
+            "SELECT id, text, done FROM todos WHERE id = ?",
+            (todo_id,)).fetchone()
+        return self._row_to_todo(row) if row else None
+
+    def get_all(self) -> list[Todo]:
+        """Get all Todo items."""
+        rows = self._conn().execute(
+            "SELECT id, text, done FROM todos ORDER BY id").fetchall()
+        return [self._row_to_todo(row) for row in rows]
+
+    def get_all_json(self) -> bytes:
+        """Get all Todo items as a JSON-encoded bytes payload."""
+        return TODO_LIST_ADAPTER.dump_json(self.get_all())
+
+    def save(self, todo_create: TodoCreate) -> Todo:
+        """Save a new Todo and assign it an id.
+
+        :param todo_create: a TodoCreate object with info for the new Todo.
+        :return: The created Todo with its assigned id.
+        """
+        cur = self._conn().execute(
+            "INSERT INTO todos (text, done) VALUES (?, ?)",
+            (todo_create.text, int(todo_create.done)))
+        return Todo(id=cur.lastrowid, **todo_create.model_dump())
+
+    def save_many(self, todo_creates: list[TodoCreate]) -> list[Todo]:
+        """Save several new Todos in one batch (a single transaction).
+
+        :param todo_creates: TodoCreate objects with info for the new Todos.
+        :return: The created Todos with their assigned ids, in order.
+        """
+        conn = self._conn()
+        created = []
+        conn.execute("BEGIN")
+        try:
+            for tc in todo_creates:
+                cur = conn.execute(
+                    "INSERT INTO todos (text, done) VALUES (?, ?)",
+                    (tc.text, int(tc.done)))
+                created.append(Todo(id=cur.lastrowid, **tc.model_dump()))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return created
+
+    def update(self, todo: Todo) -> Todo:
+        """Update an existing Todo."""
+        cur = self._conn().execute(
+            "UPDATE todos SET text = ?, done = ? WHERE id = ?",
+            (todo.text, int(todo.done), todo.id))
+        if cur.rowcount == 0:
             raise ValueError(f"Todo id {todo.id} not found in saved Todos")
-        self.todos[todo_id] = todo
-        self._write_all(list(self.todos.values()))
         return todo
 
+    def update_by_id(self, todo_id: int, text: str, done: bool) -> Todo | None:
+        """Update the Todo with the given id, if it exists.
+
+        :return: The updated Todo, or None if the id is unknown.
+        """
+        cur = self._conn().execute(
+            "UPDATE todos SET text = ?, done = ? WHERE id = ?",
+            (text, int(done), todo_id))
+        if cur.rowcount == 0:
+            return None
+        return Todo.model_construct(id=todo_id, text=text, done=done)
+
     def delete(self, todo_id: int) -> None:
         """Delete a Todo by its id."""
-        if todo_id not in self.todos:
+        cur = self._conn().execute(
+            "DELETE FROM todos WHERE id = ?", (todo_id,))
+        if cur.rowcount == 0:
             raise ValueError(f"Todo id {todo_id} not found")
-        del self.todos[todo_id]
-        self._write_all(list(self.todos.values()))
+
+    def checkpoint(self) -> None:
+        """Fold the SQLite WAL back into the main database file."""
+        self._conn().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        """Checkpoint and close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self.checkpoint()
+            conn.close()
+            self._local.conn = None